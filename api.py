@@ -0,0 +1,103 @@
+"""
+Phishing Website Detection - FastAPI Prediction Service
+This FastAPI application serves the prediction endpoints on an ASGI stack.
+It reuses the model from app.py and the feature extraction from features.py;
+the web interface, authentication and chatbot stay in the Flask app.
+
+Run with:
+    uvicorn api:app --workers $(nproc) --loop uvloop --http httptools
+"""
+
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app import MAX_BATCH_SIZE, logger, model, setup_logging, predict_url, predict_urls, build_result
+from features import parse_and_validate
+
+setup_logging()
+
+# FASTAPI APP INITIALIZATION
+app = FastAPI(title="PhishGuard AI Prediction API")
+
+
+class URLRequest(BaseModel):
+    """Request body for /predict."""
+    url: str
+
+
+class BatchURLRequest(BaseModel):
+    """Request body for /predict_batch."""
+    urls: List[str]
+
+
+def error_response(message, status_code):
+    """Build an error response in the same format as the Flask app."""
+    return JSONResponse({'status': 'error', 'message': message}, status_code=status_code)
+
+# API ROUTES
+
+@app.post('/predict')
+def predict(request: URLRequest):
+    """
+    API endpoint to predict if a URL is phishing or legitimate.
+
+    Expects JSON: {"url": "https://example.com"}
+    Returns JSON: {"status": "success/error", "prediction": "safe/phishing", ...}
+    """
+    if model is None:
+        return error_response('ML model not loaded. Please train the model first.', 500)
+
+    url = request.url.strip()
+
+    # Validate and parse URL (once)
+    domain, path, query, error_msg = parse_and_validate(url)
+    if error_msg:
+        return error_response(error_msg, 400)
+
+    try:
+        # Extract features and make prediction (cached per URL)
+        feature_values, prediction, probability = predict_url(url, domain, path, query)
+        return build_result(url, feature_values, prediction, probability)
+
+    except Exception as e:
+        logger.exception("Prediction error")
+        return error_response(f'An error occurred during prediction: {str(e)}', 500)
+
+
+@app.post('/predict_batch')
+def predict_batch(request: BatchURLRequest):
+    """
+    API endpoint to predict many URLs with a single model call.
+
+    Expects JSON: {"urls": ["https://example.com", ...]}
+    Returns JSON: {"status": "success", "results": [...]} aligned by index
+    """
+    if model is None:
+        return error_response('ML model not loaded. Please train the model first.', 500)
+
+    if len(request.urls) > MAX_BATCH_SIZE:
+        return error_response(f'Too many URLs (maximum is {MAX_BATCH_SIZE})', 400)
+
+    try:
+        return {
+            'status': 'success',
+            'results': predict_urls(request.urls)
+        }
+
+    except Exception as e:
+        logger.exception("Batch prediction error")
+        return error_response(f'An error occurred during batch prediction: {str(e)}', 500)
+
+
+@app.get('/health')
+def health():
+    """
+    Health check endpoint to verify API is running.
+    """
+    return {
+        'status': 'healthy',
+        'model_loaded': model is not None
+    }
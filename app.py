@@ -5,29 +5,96 @@ It extracts features from URLs and uses a trained ML model for prediction.
 """
 
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, make_response
-import joblib
-import re
-from urllib.parse import urlparse
+from flask.json.provider import DefaultJSONProvider
+from functools import lru_cache
+from itertools import chain
+import atexit
+import logging
+import logging.handlers
+import queue
+import numpy as np
+import onnxruntime as ort
+import orjson
 import os
 from groq import Groq
 from dotenv import load_dotenv
 from models import UserStorage, URLAnalysisStorage
+from features import FEATURE_ORDER, extract_features, extract_features_dict, parse_and_validate
 import json
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger('phish')
+log_listener = None
+
+
+def setup_logging():
+    """
+    Route all logging through a queue written by a background listener thread,
+    so request threads never block on stdout while logging errors.
+    
+    Called by the entry points (python app.py, create_app() for gunicorn and
+    api.py), not at import. Safe to call more than once.
+    """
+    global log_listener
+    if log_listener is not None:
+        return
+    
+    log_queue = queue.Queue(-1)
+    
+    # The QueueHandler keeps its default '%(message)s' formatting; the
+    # timestamped format is applied once, on the listener side
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
 # FLASK APP INITIALIZATION
 app = Flask(__name__)
 
-# Load the trained ML model
-MODEL_PATH = 'model/phishing_model.pkl'
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes jsonify() responses with orjson.
+    
+    Only response() is overridden. dumps/loads stay on the stdlib defaults
+    because the session serializer passes kwargs (e.g. object_hook) that
+    orjson does not support.
+    """
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype=self.mimetype)
+
+
+app.json = OrjsonProvider(app)
+
+# Load the trained ML model (exported to ONNX by train_model.py)
+MODEL_PATH = 'model/phishing_model.onnx'
+
+# Maximum number of URLs accepted by a single /predict_batch request
+MAX_BATCH_SIZE = 1000
+
+# Probabilities (legitimate, phishing) reported for URLs flagged by the
+# policy rule in is_obvious_phishing instead of the model
+RULE_PROBABILITY = (0.01, 0.99)
+
+# LRU cache size for predict_url (model results per URL); phishing campaigns
+# hit the same URLs over and over, so repeats skip extraction and the model
+PREDICTION_CACHE_SIZE = 50000
 
 try:
-    model = joblib.load(MODEL_PATH)
+    model = ort.InferenceSession(MODEL_PATH, providers=['CPUExecutionProvider'])
     print("✓ Model loaded successfully!")
-except Exception as e:
-    print(f"✗ Error loading model: {e}")
+except Exception:
+    logger.exception("Error loading model from %s. Please run 'python train_model.py' first "
+                     "to train the model.", MODEL_PATH)
     model = None
 
 # Secret key for flash messages (required even without sessions)
@@ -44,109 +111,187 @@ else:
     print("  Set GROQ_API_KEY environment variable to enable chatbot.")
     groq_client = None
 
-# FEATURE EXTRACTION FUNCTIONS
+# PREDICTION FUNCTIONS
 
-def extract_features(url):
+def is_obvious_phishing(feature_values):
     """
+    Policy rule: an IP-address host or an '@' in the URL is treated as
+    phishing without consulting the model.
+    
+    Both are strong, rarely legitimate signals, so these URLs skip the
+    forest traversal entirely.
     
     Args:
-        url (str): The URL to analyze
+        feature_values (tuple): Features as returned by extract_features
     
     Returns:
-        dict: Dictionary containing all extracted features
+        bool: True if the URL is phishing by rule
+    """
+    # FEATURE_ORDER: isIp is column 0, is@ is column 2
+    return bool(feature_values[0] or feature_values[2])
+
+
+def predict_proba(X):
     """
+    Run the ONNX model on a feature matrix.
     
-    features = {}
+    Args:
+        X (np.ndarray): float32 array of shape (N, 7) in FEATURE_ORDER
     
-    try:
-        # Parse the URL
-        parsed = urlparse(url)
-        domain = parsed.netloc
-        path = parsed.path
-        query = parsed.query
-        
-        # Build the full URL without protocol for length calculation
-        # This matches how the dataset stores URLs (domain + path + query)
-        url_without_protocol = domain + path
-        if query:
-            url_without_protocol += '?' + query
-        
-        # Feature 1: isIp - Check if URL contains an IP address instead of domain
-        # Phishing sites often use IP addresses to avoid DNS tracking
-        ip_pattern = re.compile(r'(\d{1,3}\.){3}\d{1,3}')
-        features['isIp'] = 1 if ip_pattern.search(domain) else 0
-        
-        # Feature 2: urlLen - Length of FULL URL (domain + path + query)
-        # This matches the dataset format where urlLen includes the path
-        features['urlLen'] = len(url_without_protocol)
-        
-        # Feature 3: is@ - Check for @ symbol in URL
-        # @ symbol can be used to hide the real domain (e.g., http://google.com@malicious.com)
-        features['is@'] = 1 if '@' in url else 0
-        
-        # Feature 4: isredirect - Check for // in PATH only (not in protocol!)
-        # Multiple slashes in path can indicate URL redirection attempts
-        # We exclude the protocol part (https://) by checking path and query only
-        path_and_query = path + '?' + query if query else path
-        features['isredirect'] = 1 if '//' in path_and_query else 0
-        
-        # Feature 5: haveDash - Check for dash (-) in domain
-        # Legitimate domains rarely use dashes; phishing sites use them for brand impersonation
-        features['haveDash'] = 1 if '-' in domain else 0
-        
-        # Feature 6: domainLen - Length of the domain name only
-        # Longer domains may indicate suspicious activity
-        features['domainLen'] = len(domain)
-        
-        # Feature 7: nosOfSubdomain - Count number of subdomains
-        # Multiple subdomains can be a sign of phishing (e.g., login.secure.paypal.fake.com)
-        # Count the number of dots in domain (dots = subdomains + 1)
-        if domain:
-            features['nosOfSubdomain'] = domain.count('.')
-        else:
-            features['nosOfSubdomain'] = 0
-        
-        return features
+    Returns:
+        np.ndarray: Class probabilities of shape (N, 2) - (legitimate, phishing)
+    """
+    return model.run(['probabilities'], {'X': X})[0]
+
+
+@lru_cache(maxsize=PREDICTION_CACHE_SIZE)
+def predict_url(url, domain, path, query):
+    """
+    Extract features from a URL and run the model on them.
     
-    except Exception as e:
-        print(f"Error extracting features: {e}")
-        # Return default safe values if extraction fails
-        return {
-            'isIp': 0,
-            'urlLen': 0,  # Domain length, not full URL
-            'is@': 0,
-            'isredirect': 0,
-            'haveDash': 0,
-            'domainLen': 0,
-            'nosOfSubdomain': 0
+    Results are cached per URL, so a repeated URL skips both feature
+    extraction and the model call.
+    
+    Args:
+        url (str): A validated URL
+        domain, path, query (str): URL parts from parse_and_validate
+    
+    Returns:
+        tuple: (feature_values, prediction, probability) where probability
+               is (legitimate, phishing)
+    """
+    feature_values = extract_features(url, domain, path, query)
+    if is_obvious_phishing(feature_values):
+        return feature_values, 1, RULE_PROBABILITY
+    
+    feature_vector = np.array([feature_values], dtype=np.float32)
+    
+    # One forest traversal: the predicted class is the most probable one
+    probability = predict_proba(feature_vector)[0]
+    prediction = int(probability.argmax())
+    
+    return feature_values, prediction, tuple(float(p) for p in probability)
+
+
+def build_result(url, feature_values, prediction, probability):
+    """
+    Build the JSON result for one analyzed URL.
+    
+    Args:
+        url (str): The analyzed URL
+        feature_values (tuple): Features as returned by extract_features
+        prediction (int): 1 for phishing, 0 for legitimate
+        probability (sequence): (legitimate, phishing) probabilities
+    
+    Returns:
+        dict: Result in the /predict response format
+    """
+    return {
+        'status': 'success',
+        'url': url,
+        'prediction': 'phishing' if prediction == 1 else 'safe',
+        'confidence': max(probability) * 100,
+        'features': extract_features_dict(feature_values),
+        'details': {
+            'legitimacy_score': probability[0] * 100,
+            'phishing_score': probability[1] * 100
         }
+    }
 
 
-def validate_url(url):
+def predict_urls(urls):
     """
-    Validate if the provided string is a proper URL.
+    Validate and predict a list of URLs with a single model call.
     
     Args:
-        url (str): URL to validate
+        urls (list): URLs to analyze
     
     Returns:
-        tuple: (is_valid, error_message)
+        list: One result dict per URL, in the same order; invalid URLs get
+              {'status': 'error', 'url': ..., 'message': ...}
+    """
+    results = [None] * len(urls)
+    row_of_url = {}
+    row_positions = []
+    row_parts = []
+    
+    # Validate every URL; repeated URLs share one feature row
+    for i, url in enumerate(urls):
+        if not isinstance(url, str):
+            results[i] = {
+                'status': 'error',
+                'url': url,
+                'message': 'URL must be a string'
+            }
+            continue
+        
+        url = url.strip()
+        
+        row = row_of_url.get(url)
+        if row is not None:
+            row_positions[row].append(i)
+            continue
+        
+        domain, path, query, error_msg = parse_and_validate(url)
+        if error_msg:
+            results[i] = {
+                'status': 'error',
+                'url': url,
+                'message': error_msg
+            }
+            continue
+        
+        row_of_url[url] = len(row_positions)
+        row_positions.append([i])
+        row_parts.append((domain, path, query))
+    
+    # Extract features, apply the policy rule, then run the model once over
+    # the remaining rows, packed into a flat float32 (N, 7) buffer
+    rows = [extract_features(url, *parts) for url, parts in zip(row_of_url, row_parts)]
+    model_rows = [row for row in rows if not is_obvious_phishing(row)]
+    
+    if model_rows:
+        n_features = len(FEATURE_ORDER)
+        X = np.fromiter(chain.from_iterable(model_rows), dtype=np.float32,
+                        count=len(model_rows) * n_features).reshape(len(model_rows), n_features)
+        probabilities = predict_proba(X)
+        # Plain Python ints/floats, the same values predict_url returns
+        model_predictions = iter(probabilities.argmax(axis=1).tolist())
+        model_probabilities = iter(probabilities.tolist())
+    
+    for url, feature_values, positions in zip(row_of_url, rows, row_positions):
+        if is_obvious_phishing(feature_values):
+            prediction, probability = 1, RULE_PROBABILITY
+        else:
+            prediction = next(model_predictions)
+            probability = next(model_probabilities)
+        
+        result = build_result(url, feature_values, prediction, probability)
+        for i in positions:
+            results[i] = result
+    
+    return results
+
+
+def _warmup():
     """
-    if not url or url.strip() == '':
-        return False, "URL cannot be empty"
+    Run a dummy feature extraction and prediction at startup.
     
-    # Check if URL has a scheme (http:// or https://)
-    if not url.startswith(('http://', 'https://')):
-        return False, "URL must start with http:// or https://"
+    The first ONNX Runtime call initializes kernels and thread pools; doing
+    it here keeps that cost off the first real request.
+    """
+    url = 'https://example.com/a'
+    domain, path, query, _ = parse_and_validate(url)
+    extract_features(url, domain, path, query)
     
-    # Basic URL structure validation
-    try:
-        parsed = urlparse(url)
-        if not parsed.netloc:
-            return False, "Invalid URL format"
-        return True, None
-    except Exception as e:
-        return False, f"Invalid URL: {str(e)}"
+    if model is not None:
+        try:
+            predict_proba(np.zeros((1, len(FEATURE_ORDER)), dtype=np.float32))
+        except Exception:
+            logger.exception("Error warming up model")
+
+
+_warmup()
 
 # FLASK ROUTES
 
@@ -329,44 +474,17 @@ def predict():
         
         url = data['url'].strip()
         
-        # Validate URL
-        is_valid, error_msg = validate_url(url)
-        if not is_valid:
+        # Validate and parse URL (once)
+        domain, path, query, error_msg = parse_and_validate(url)
+        if error_msg:
             return jsonify({
                 'status': 'error',
                 'message': error_msg
             }), 400
         
-        # Extract features from URL
-        features = extract_features(url)
-        
-        # Prepare features for prediction (must match training order)
-        feature_vector = [[
-            features['isIp'],
-            features['urlLen'],
-            features['is@'],
-            features['isredirect'],
-            features['haveDash'],
-            features['domainLen'],
-            features['nosOfSubdomain']
-        ]]
-        
-        # Make prediction
-        prediction = model.predict(feature_vector)[0]
-        probability = model.predict_proba(feature_vector)[0]
-        
-        # Prepare response
-        result = {
-            'status': 'success',
-            'url': url,
-            'prediction': 'phishing' if prediction == 1 else 'safe',
-            'confidence': float(max(probability) * 100),
-            'features': features,
-            'details': {
-                'legitimacy_score': float(probability[0] * 100),
-                'phishing_score': float(probability[1] * 100)
-            }
-        }
+        # Extract features and make prediction (cached per URL)
+        feature_values, prediction, probability = predict_url(url, domain, path, query)
+        result = build_result(url, feature_values, prediction, probability)
         
         # Save analysis to Excel if user is logged in (via cookie)
         username = request.cookies.get('username')
@@ -376,27 +494,77 @@ def predict():
                 analysis_storage.add_analysis(
                     username=username,
                     url=url,
-                    prediction='phishing' if prediction == 1 else 'safe',
-                    confidence=float(max(probability) * 100),
-                    legitimacy_score=float(probability[0] * 100),
-                    phishing_score=float(probability[1] * 100),
-                    features=features,
+                    prediction=result['prediction'],
+                    confidence=result['confidence'],
+                    legitimacy_score=result['details']['legitimacy_score'],
+                    phishing_score=result['details']['phishing_score'],
+                    features=result['features'],
                     ip_address=request.remote_addr,
                     user_agent=request.headers.get('User-Agent', '')[:500]
                 )
-            except Exception as e:
-                print(f"Error saving analysis to Excel: {e}")
+            except Exception:
+                logger.exception("Error saving analysis to Excel")
         
         return jsonify(result), 200
     
     except Exception as e:
-        print(f"Prediction error: {e}")
+        logger.exception("Prediction error")
         return jsonify({
             'status': 'error',
             'message': f'An error occurred during prediction: {str(e)}'
         }), 500
 
 
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    """
+    API endpoint to predict many URLs with a single model call.
+    
+    Expects JSON: {"urls": ["https://example.com", ...]}
+    Returns JSON: {"status": "success", "results": [...]} aligned by index
+    """
+    
+    try:
+        # Check if model is loaded
+        if model is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'ML model not loaded. Please train the model first.'
+            }), 500
+        
+        # Get URLs from request
+        data = request.get_json()
+        
+        if not isinstance(data, dict) or not isinstance(data.get('urls'), list):
+            return jsonify({
+                'status': 'error',
+                'message': 'No URLs provided'
+            }), 400
+        
+        urls = data['urls']
+        
+        if len(urls) > MAX_BATCH_SIZE:
+            return jsonify({
+                'status': 'error',
+                'message': f'Too many URLs (maximum is {MAX_BATCH_SIZE})'
+            }), 400
+        
+        # Validate, extract and predict all URLs in one model call
+        results = predict_urls(urls)
+        
+        return jsonify({
+            'status': 'success',
+            'results': results
+        }), 200
+    
+    except Exception as e:
+        logger.exception("Batch prediction error")
+        return jsonify({
+            'status': 'error',
+            'message': f'An error occurred during batch prediction: {str(e)}'
+        }), 500
+
+
 @app.route('/health')
 def health():
     """
@@ -508,17 +676,19 @@ If asked about specific URLs, recommend using the URL analysis tool for accurate
                 'message': f'An error occurred: {str(e)}'
             }), 500
 
+def create_app():
+    """
+    WSGI entry point: set up logging and return the Flask app.
+    
+    Used by gunicorn as "app:create_app()".
+    """
+    setup_logging()
+    return app
+
 # MAIN EXECUTION
 
 if __name__ == '__main__':
-    # Check if model exists
-    if not os.path.exists(MODEL_PATH):
-        print("=" * 60)
-        print("⚠ WARNING: Model file not found!")
-        print("=" * 60)
-        print(f"Expected location: {MODEL_PATH}")
-        print("\nPlease run 'python train_model.py' first to train the model.")
-        print("=" * 60)
+    setup_logging()
     
     # Run Flask app
     print("\n" + "=" * 60)
@@ -529,4 +699,6 @@ if __name__ == '__main__':
     print("\nPress CTRL+C to stop the server")
     print("=" * 60 + "\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Debug mode (reloader + debugger) only when FLASK_ENV=dev; for production
+    # run under gunicorn instead: gunicorn -w $(nproc) -k gthread --threads 4 -b 0.0.0.0:5000 "app:create_app()"
+    app.run(debug=os.getenv('FLASK_ENV') == 'dev', host='0.0.0.0', port=5000)
@@ -0,0 +1,188 @@
+"""
+Phishing Website Detection - URL Feature Extraction
+Extracts the 7 URL features used by the ML model. Shared by the Flask app
+(app.py) and the FastAPI service (api.py).
+"""
+
+from functools import lru_cache
+import logging
+
+logger = logging.getLogger('phish')
+
+# Feature column order used during training (model input layout)
+FEATURE_ORDER = ['isIp', 'urlLen', 'is@', 'isredirect', 'haveDash', 'domainLen', 'nosOfSubdomain']
+
+# LRU cache size for extract_features (feature tuples per URL)
+FEATURE_CACHE_SIZE = 65536
+
+# FEATURE EXTRACTION FUNCTIONS
+
+def _is_ip(domain):
+    """
+    Check whether a domain is a dotted-quad IP address (d.d.d.d).
+    
+    No regex: the host must contain exactly 3 dots (one str.count), then a
+    single scan of its bytes checks that every segment is 1-3 digits.
+    Credentials (user@) and a port (:8080) are ignored.
+    
+    Args:
+        domain (str): The netloc part of the URL
+    
+    Returns:
+        int: 1 if the host is an IP address, 0 otherwise
+    """
+    host = domain.rpartition('@')[2].partition(':')[0]
+    
+    # Most hosts don't have exactly 3 dots; reject them with one C-level count
+    # before falling back to the per-byte scan
+    if host.count('.') != 3:
+        return 0
+    
+    segment_len = 0
+    for byte in host.encode():
+        if byte == 46:  # '.'
+            if segment_len == 0:
+                return 0
+            segment_len = 0
+        elif 48 <= byte <= 57:  # '0'-'9'
+            segment_len += 1
+            if segment_len > 3:
+                return 0
+        else:
+            return 0
+    
+    return 1 if segment_len > 0 else 0
+
+
+def _split_url(url):
+    """
+    Split a URL into the parts used by feature extraction.
+    
+    A minimal replacement for urlparse: only the netloc, path and query
+    boundaries are located (with str.find), the fragment is dropped and
+    no ParseResult is built.
+    
+    Args:
+        url (str): The URL to split
+    
+    Returns:
+        tuple: (netloc, path, query)
+    """
+    end = url.find('#')
+    if end < 0:
+        end = len(url)
+    
+    query_start = url.find('?', 0, end)
+    if query_start < 0:
+        query = ''
+        query_start = end
+    else:
+        query = url[query_start + 1:end]
+    
+    scheme_end = url.find('://', 0, query_start)
+    if scheme_end < 0:
+        return '', url[:query_start], query
+    
+    netloc_start = scheme_end + 3
+    path_start = url.find('/', netloc_start, query_start)
+    if path_start < 0:
+        path_start = query_start
+    
+    return url[netloc_start:path_start], url[path_start:query_start], query
+
+
+@lru_cache(maxsize=FEATURE_CACHE_SIZE)
+def extract_features(url, domain, path, query):
+    """
+    Extract the 7 model features from a URL.
+    
+    Args:
+        url (str): The URL to analyze
+        domain (str): netloc part, as returned by parse_and_validate
+        path (str): path part, as returned by parse_and_validate
+        query (str): query part, as returned by parse_and_validate
+    
+    Returns:
+        tuple: Feature values in FEATURE_ORDER (model input order)
+    """
+    
+    try:
+        # Feature 1: isIp - Check if URL contains an IP address instead of domain
+        # Phishing sites often use IP addresses to avoid DNS tracking
+        is_ip = _is_ip(domain)
+        
+        # Feature 2: urlLen - Length of FULL URL (domain + path + query)
+        # This matches the dataset format where urlLen includes the path
+        # Computed from the part lengths (+1 for '?') instead of joining them
+        url_len = len(domain) + len(path) + (len(query) + 1 if query else 0)
+        
+        # Feature 3: is@ - Check for @ symbol in URL
+        # @ symbol can be used to hide the real domain (e.g., http://google.com@malicious.com)
+        is_at = 1 if '@' in url else 0
+        
+        # Feature 4: isredirect - Check for // in PATH only (not in protocol!)
+        # Multiple slashes in path can indicate URL redirection attempts
+        # We exclude the protocol part (https://) by checking path and query only
+        # ('//' can't straddle the '?' separator, so check each part on its own)
+        is_redirect = 1 if ('//' in path or '//' in query) else 0
+        
+        # Feature 5: haveDash - Check for dash (-) in domain
+        # Legitimate domains rarely use dashes; phishing sites use them for brand impersonation
+        have_dash = 1 if '-' in domain else 0
+        
+        # Feature 6: domainLen - Length of the domain name only
+        # Longer domains may indicate suspicious activity
+        domain_len = len(domain)
+        
+        # Feature 7: nosOfSubdomain - Count number of subdomains
+        # Multiple subdomains can be a sign of phishing (e.g., login.secure.paypal.fake.com)
+        # Count the number of dots in domain (dots = subdomains + 1)
+        nos_of_subdomain = domain.count('.')
+        
+        return (is_ip, url_len, is_at, is_redirect, have_dash, domain_len, nos_of_subdomain)
+    
+    except Exception:
+        logger.exception("Error extracting features from %r", url)
+        # Return default safe values if extraction fails
+        return (0, 0, 0, 0, 0, 0, 0)
+
+
+def extract_features_dict(features):
+    """
+    Convert a feature tuple into the named dict used in JSON responses.
+    
+    Args:
+        features (tuple): Feature values as returned by extract_features
+    
+    Returns:
+        dict: Feature name -> value, keyed by FEATURE_ORDER
+    """
+    return dict(zip(FEATURE_ORDER, features))
+
+
+def parse_and_validate(url):
+    """
+    Validate a URL and split it into the parts used by feature extraction.
+    
+    The URL is parsed only once per request: the parts returned here are
+    passed straight on to extract_features.
+    
+    Args:
+        url (str): URL to validate
+    
+    Returns:
+        tuple: (netloc, path, query, error_message); error_message is None
+               if the URL is valid
+    """
+    if not url or url.strip() == '':
+        return '', '', '', "URL cannot be empty"
+    
+    # Check if URL has a scheme (http:// or https://)
+    if not url.startswith(('http://', 'https://')):
+        return '', '', '', "URL must start with http:// or https://"
+    
+    # Basic URL structure validation
+    netloc, path, query = _split_url(url)
+    if not netloc:
+        return netloc, path, query, "Invalid URL format"
+    return netloc, path, query, None
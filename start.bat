@@ -32,7 +32,7 @@ echo.
 
 REM Step 3: Train ML model (if not already trained)
 echo [3/5] Checking if ML model exists...
-if not exist "model\phishing_model.pkl" (
+if not exist "model\phishing_model.onnx" (
     echo Model not found. Training new model...
     python train_model.py
     if errorlevel 1 (
@@ -0,0 +1,127 @@
+"""
+Tests for the Flask app (app.py).
+The ONNX model is not needed: tests that reach the model stub predict_proba.
+
+Run with: python -m unittest test_app  (or pytest)
+"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import app as app_module
+from app import app
+
+
+def stub_predict_proba(X):
+    """Stand-in for the ONNX model: every row is 80% legitimate."""
+    return np.tile(np.array([0.8, 0.2], dtype=np.float32), (len(X), 1))
+
+
+class TestJSONProvider(unittest.TestCase):
+
+    def test_flash_round_trips_through_session(self):
+        # Flashed messages are stored as tagged tuples in the session cookie;
+        # the JSON provider must hand them back as (category, message)
+        client = app.test_client()
+        client.get('/logout')
+        
+        with client.session_transaction() as session:
+            self.assertEqual(session['_flashes'],
+                             [('info', 'You have been logged out successfully.')])
+        
+        response = client.get('/login')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'You have been logged out successfully.', response.data)
+
+    def test_jsonify_uses_orjson(self):
+        with app.app_context():
+            response = app.json.response({'status': 'healthy', 'score': 98.5})
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(response.get_data(), b'{"status":"healthy","score":98.5}')
+
+
+
+class TestPredictUrls(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(app_module, 'predict_proba', side_effect=stub_predict_proba)
+        self.predict_proba = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def model_rows(self):
+        """Number of rows sent to the model, per call."""
+        return [len(call.args[0]) for call in self.predict_proba.call_args_list]
+
+    def test_duplicates_share_one_row(self):
+        results = app_module.predict_urls(['https://a.com', 'https://b.com', ' https://a.com '])
+        
+        self.assertEqual(self.model_rows(), [2])
+        self.assertEqual([r['url'] for r in results], ['https://a.com', 'https://b.com', 'https://a.com'])
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(results[0]['prediction'], 'safe')
+
+    def test_invalid_entries_keep_their_positions(self):
+        results = app_module.predict_urls(['bad', 'https://a.com', '', 'http://u@a.com', 'https://b.com'])
+        
+        self.assertEqual(self.model_rows(), [2])
+        self.assertEqual([r['status'] for r in results], ['error', 'success', 'error', 'success', 'success'])
+        self.assertEqual(results[0]['message'], 'URL must start with http:// or https://')
+        self.assertEqual(results[2]['message'], 'URL cannot be empty')
+        self.assertEqual([results[i]['url'] for i in (1, 3, 4)], ['https://a.com', 'http://u@a.com', 'https://b.com'])
+        # '@' is rule-flagged, the others come from the model
+        self.assertEqual([results[i]['prediction'] for i in (1, 3, 4)], ['safe', 'phishing', 'safe'])
+
+    def test_non_string_entries(self):
+        results = app_module.predict_urls([None, ['https://a.com'], 'https://a.com'])
+        
+        self.assertEqual(results[0], {'status': 'error', 'url': None, 'message': 'URL must be a string'})
+        self.assertEqual(results[1], {'status': 'error', 'url': ['https://a.com'], 'message': 'URL must be a string'})
+        self.assertEqual(results[2]['status'], 'success')
+
+    def test_all_rule_flagged_skips_the_model(self):
+        results = app_module.predict_urls(['http://1.2.3.4/login', 'http://u@a.com', 'http://1.2.3.4/login'])
+        
+        self.predict_proba.assert_not_called()
+        self.assertEqual([r['prediction'] for r in results], ['phishing'] * 3)
+        self.assertEqual(results[0]['confidence'], 99.0)
+
+    def test_scores_are_plain_python_values(self):
+        result = app_module.predict_urls(['https://a.com'])[0]
+        
+        self.assertIs(type(result['confidence']), float)
+        self.assertIs(type(result['details']['phishing_score']), float)
+
+    def test_empty_batch(self):
+        self.assertEqual(app_module.predict_urls([]), [])
+        self.predict_proba.assert_not_called()
+
+
+class TestPredictBatchRoute(unittest.TestCase):
+
+    def setUp(self):
+        patchers = [
+            mock.patch.object(app_module, 'model', object()),
+            mock.patch.object(app_module, 'predict_proba', stub_predict_proba),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = app.test_client()
+
+    def test_non_object_body_is_rejected(self):
+        response = self.client.post('/predict_batch', json=['https://example.com'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['message'], 'No URLs provided')
+
+    def test_non_string_entry_is_echoed(self):
+        response = self.client.post('/predict_batch', json={'urls': [42, 'https://example.com']})
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['results']
+        self.assertEqual(results[0], {'status': 'error', 'url': 42, 'message': 'URL must be a string'})
+        self.assertEqual(results[1]['prediction'], 'safe')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests for URL feature extraction (features.py).
+Pins the hand-rolled URL splitter and IP check against urlparse and the
+known differences, so the features can't silently drift away from what
+the model was trained on.
+
+Run with: python -m unittest test_features  (or pytest)
+"""
+
+import unittest
+from urllib.parse import urlparse
+
+from features import FEATURE_ORDER, _is_ip, _split_url, extract_features, parse_and_validate
+
+
+# Ordinary http(s) URLs where _split_url must agree with urlparse
+PLAIN_URLS = [
+    'https://example.com',
+    'https://example.com/',
+    'http://www.example.com/login/index.html',
+    'http://a.com/b/c?x=1#frag',
+    'http://a.com?x=/y',
+    'http://a.com#frag?x',
+    'https://a-b.c.d.com/path/',
+    'http://user@1.2.3.4:8080/p//q?r=http://b',
+    'http://a.com/?u=http://b.com//x',
+    'https://paypal.com.secure-login.example.net/signin?next=%2Faccount',
+    'http://',
+]
+
+
+class TestSplitUrl(unittest.TestCase):
+
+    def test_matches_urlparse(self):
+        for url in PLAIN_URLS:
+            with self.subTest(url=url):
+                parsed = urlparse(url)
+                self.assertEqual(_split_url(url), (parsed.netloc, parsed.path, parsed.query))
+
+    def test_params_stay_in_path(self):
+        # urlparse moves ';p=1' into .params; _split_url keeps it in the path
+        self.assertEqual(_split_url('http://a.com/x;p=1'), ('a.com', '/x;p=1', ''))
+
+    def test_control_characters_not_stripped(self):
+        # urlparse silently drops tab/newline characters
+        self.assertEqual(_split_url('http://a.com/a\tb\n'), ('a.com', '/a\tb\n', ''))
+
+
+class TestParseAndValidate(unittest.TestCase):
+
+    def test_valid_url(self):
+        self.assertEqual(parse_and_validate('https://example.com/a?b=1'),
+                         ('example.com', '/a', 'b=1', None))
+
+    def test_errors(self):
+        self.assertEqual(parse_and_validate('')[3], "URL cannot be empty")
+        self.assertEqual(parse_and_validate('ftp://example.com')[3],
+                         "URL must start with http:// or https://")
+        self.assertEqual(parse_and_validate('http:///path')[3], "Invalid URL format")
+
+    def test_unbalanced_ipv6_bracket_accepted(self):
+        # urlparse raises ValueError('Invalid IPv6 URL') here
+        self.assertEqual(parse_and_validate('http://[abc'), ('[abc', '', '', None))
+
+
+class TestIsIp(unittest.TestCase):
+
+    def test_ip_hosts(self):
+        for domain in ['1.2.3.4', '192.168.0.1:8080', 'user@10.0.0.1']:
+            with self.subTest(domain=domain):
+                self.assertEqual(_is_ip(domain), 1)
+
+    def test_non_ip_hosts(self):
+        for domain in ['example.com', '', '1.2.3', '1.2.3.4.5', '1..2.3', '1.2.3.', 'a.b.c.d']:
+            with self.subTest(domain=domain):
+                self.assertEqual(_is_ip(domain), 0)
+
+    def test_only_whole_host_counts(self):
+        # The old unanchored regex search matched both of these
+        self.assertEqual(_is_ip('1234.1.1.1'), 0)
+        self.assertEqual(_is_ip('1.2.3.4.nip.io'), 0)
+
+
+class TestExtractFeatures(unittest.TestCase):
+
+    def extract(self, url):
+        domain, path, query, error = parse_and_validate(url)
+        self.assertIsNone(error)
+        return dict(zip(FEATURE_ORDER, extract_features(url, domain, path, query)))
+
+    def test_plain_url(self):
+        self.assertEqual(self.extract('https://example.com/login'), {
+            'isIp': 0, 'urlLen': 17, 'is@': 0, 'isredirect': 0,
+            'haveDash': 0, 'domainLen': 11, 'nosOfSubdomain': 1
+        })
+
+    def test_suspicious_url(self):
+        self.assertEqual(self.extract('http://u@192.168.0.1/a//b?c=d#f'), {
+            'isIp': 1, 'urlLen': 22, 'is@': 1, 'isredirect': 1,
+            'haveDash': 0, 'domainLen': 13, 'nosOfSubdomain': 3
+        })
+
+    def test_url_len_excludes_scheme_and_fragment(self):
+        features = self.extract('https://my-site.co.uk/p?q=1#top')
+        self.assertEqual(features['urlLen'], len('my-site.co.uk/p?q=1'))
+        self.assertEqual(features['haveDash'], 1)
+        self.assertEqual(features['nosOfSubdomain'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()